@@ -20,21 +20,37 @@
 # - TAB_ADV                        default: ADV_GAME_STATS
 # - LOOKBACK_DAYS                  default: 60
 # - MAX_GAMES_PER_RUN              default: 12
+# - ERR_BACKOFF_HOURS              default: 6   (wait before retrying an ERR row; doubles per attempt)
+# - ERR_BACKOFF_MAX_HOURS          default: 168
 # - REQ_TIMEOUT                    default: 45
 # - MAX_TRIES                      default: 8
 # - SLEEP_BASE                     default: 1.25
+# - FETCH_WORKERS                  default: 3
+# - NBA_RATE                       default: 1.0 (NBA requests/sec, shared by all threads; min 0.05)
+# - NBA_BURST                      default: 3
+# - SHEETS_DISCOVERY_PATH          default: sheets_v4.json next to this file (fetched at image build)
+# - SCOREBOARD_CACHE_PATH          default: /tmp/nba_scoreboard_cache.json
+# - SCOREBOARD_CACHE_BUCKET        optional: GCS bucket to persist the scoreboard cache
+# - SCOREBOARD_CACHE_BLOB          default: nba_scoreboard_cache.json
 
 import os
+import json
 import time
 import random
 import re
-from datetime import datetime, timedelta
+import threading
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
+from collections import defaultdict
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Any, Tuple, Optional
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
 import google.auth
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
 
 
 # =========================
@@ -47,12 +63,39 @@ TAB_ADV = os.environ.get("TAB_ADV", "ADV_GAME_STATS").strip()
 LOOKBACK_DAYS = int(os.environ.get("LOOKBACK_DAYS", "60"))
 MAX_GAMES_PER_RUN = int(os.environ.get("MAX_GAMES_PER_RUN", "12"))
 
+# ERR rows are retried with exponential backoff; attempts are kept in Status as "ERR(n): ..."
+ERR_BACKOFF_HOURS = float(os.environ.get("ERR_BACKOFF_HOURS", "6"))
+ERR_BACKOFF_MAX_HOURS = float(os.environ.get("ERR_BACKOFF_MAX_HOURS", "168"))
+
 REQ_TIMEOUT = int(os.environ.get("REQ_TIMEOUT", "45"))
 MAX_TRIES = int(os.environ.get("MAX_TRIES", "8"))
 SLEEP_BASE = float(os.environ.get("SLEEP_BASE", "1.25"))
 
+# date -> scoreboard games, so settled dates are not re-fetched every run.
+# /tmp survives on warm Cloud Run instances; set a bucket to survive cold starts too.
+SCOREBOARD_CACHE_PATH = os.environ.get("SCOREBOARD_CACHE_PATH", "/tmp/nba_scoreboard_cache.json").strip()
+SCOREBOARD_CACHE_BUCKET = os.environ.get("SCOREBOARD_CACHE_BUCKET", "").strip()
+SCOREBOARD_CACHE_BLOB = os.environ.get("SCOREBOARD_CACHE_BLOB", "nba_scoreboard_cache.json").strip()
+
+# games fetched in parallel (kept small; stats.nba.com throttles aggressively)
+FETCH_WORKERS = max(1, int(os.environ.get("FETCH_WORKERS", "3")))
+
+# shared NBA request budget (replaces fixed sleeps between calls)
+NBA_RATE = max(0.05, float(os.environ.get("NBA_RATE", "1.0")))
+NBA_BURST = max(1, int(os.environ.get("NBA_BURST", "3")))
+
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
 
+# local Sheets v4 discovery doc -> no discovery fetch when building the client
+SHEETS_DISCOVERY_PATH = os.environ.get(
+    "SHEETS_DISCOVERY_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "sheets_v4.json"),
+).strip()
+
+# raw cell values; dates come back as day serials instead of display strings
+VALUE_RENDER = "UNFORMATTED_VALUE"
+DATE_RENDER = "SERIAL_NUMBER"
+
 # NBA endpoints
 URL_SCOREBOARD = "https://stats.nba.com/stats/scoreboardv2"
 URL_TRAD = "https://stats.nba.com/stats/boxscoretraditionalv2"
@@ -67,6 +110,9 @@ NBA_HEADERS = {
     "Connection": "keep-alive",
 }
 
+# consecutive failures inside nba_fetch before the pooled session is rebuilt
+SESSION_RESET_AFTER = 3
+
 # ADV_GAME_STATS expected columns (order matters for writing A:AB)
 ADV_COLUMNS = [
     "Game Date",
@@ -98,6 +144,23 @@ ADV_COLUMNS = [
     "Last Attempt",
 ]
 
+# boxscoreadvancedv2 fields written as Home/Away pairs (POSS first, then ADV_COLUMNS order from OffRtg)
+ADV_STAT_FIELDS = (
+    "POSS",
+    "OFF_RATING",
+    "EFG_PCT",
+    "TS_PCT",
+    "FTA_RATE",
+    "TM_TOV_PCT",
+    "FG3A_RATE",
+    "OREB_PCT",
+)
+
+# the only ADV columns the Game ID index reads (the other stat columns are write-only here).
+# Scanned for every row, not looked up per Game ID: the done filter in main() needs the
+# Status of every game to skip finished ones before any scoreboard/NBA work.
+ADV_INDEX_COLUMNS = ["Key", "Game ID", "Status", "Last Attempt"]
+
 COMPLETED_EXPECTED = [
     "Team",
     "Opponent",
@@ -117,36 +180,71 @@ def now_iso() -> str:
     return datetime.now().astimezone().isoformat(timespec="seconds")
 
 
-def is_num(x: Any) -> bool:
+def _safe_floats(*xs: Any) -> Optional[List[float]]:
+    """All of xs as floats, or None if any is blank / non-numeric / NaN."""
     try:
-        return x is not None and x != "" and float(x) == float(x)
+        out = [float(x) for x in xs]
     except Exception:
-        return False
+        return None
+    return None if any(v != v for v in out) else out
 
 
 def jitter_sleep(i: int) -> None:
     time.sleep(SLEEP_BASE * (1.6 ** i) + random.uniform(0, 0.5))
 
 
+_WS_RE = re.compile(r"\s+")
+
+# ESPN shorthand fixes
+_TEAM_ALIASES = {
+    "la clippers": "los angeles clippers",
+    "la lakers": "los angeles lakers",
+}
+
+
+@lru_cache(maxsize=1024)
 def normalize_team_name(s: Any) -> str:
-    t = str(s or "").strip().lower()
-    t = t.replace("\u00a0", " ")
-    t = re.sub(r"\s+", " ", t)
+    t = _WS_RE.sub(" ", str(s or "").strip().lower().replace("\u00a0", " "))
+    return _TEAM_ALIASES.get(t, t)
+
 
-    # ESPN shorthand fixes
-    t = t.replace("la clippers", "los angeles clippers")
-    t = t.replace("la lakers", "los angeles lakers")
+_ERR_RE = re.compile(r"^ERR(?:\((\d+)\))?:\s*", re.IGNORECASE)
 
-    return t
+
+def err_attempts(status: str) -> int:
+    """Attempt count in Status: ERR(3): ... -> 3, legacy ERR: ... -> 1, otherwise 0"""
+    m = _ERR_RE.match(status or "")
+    if not m:
+        return 0
+    return int(m.group(1)) if m.group(1) else 1
+
+
+def with_err_attempts(status: str, attempts: int) -> str:
+    """Re-stamp an ERR status with its attempt count (non-ERR statuses pass through)."""
+    m = _ERR_RE.match(status or "")
+    if not m:
+        return status
+    return f"ERR({attempts}): {status[m.end():]}"
+
+
+def backoff_for(attempts: int) -> timedelta:
+    hours = ERR_BACKOFF_HOURS * (2 ** max(0, attempts - 1))
+    return timedelta(hours=min(hours, ERR_BACKOFF_MAX_HOURS))
 
 
 def format_mdy(dt: datetime) -> str:
     return dt.strftime("%m/%d/%Y")
 
 
+# day 0 of Sheets' date serials
+_SHEETS_EPOCH = datetime(1899, 12, 30)
+
+
 def parse_sheet_date(value: Any) -> Optional[datetime]:
-    if value is None or value == "":
+    if value is None or value == "" or isinstance(value, bool):
         return None
+    if isinstance(value, (int, float)):
+        return _SHEETS_EPOCH + timedelta(days=float(value))
     s = str(value).strip()
 
     for fmt in (
@@ -184,25 +282,63 @@ def col_to_a1(col_idx_0: int) -> str:
     return s
 
 
+def data_range(col: Dict[str, int], needed: List[str]) -> str:
+    """A2:<last needed column> (instead of A2:ZZ)"""
+    return f"A2:{col_to_a1(max(col[name] for name in needed))}"
+
+
+def column_ranges(col: Dict[str, int], needed: List[str]) -> List[str]:
+    """One single-column A1 range (row 2 down) per needed header, same order."""
+    return [f"{col_to_a1(col[name])}2:{col_to_a1(col[name])}" for name in needed]
+
+
+def flatten_column(values: List[List[Any]]) -> List[Any]:
+    """Single-column values response -> flat list ("" for blank cells)."""
+    return [r[0] if r else "" for r in values]
+
+
 # =========================
 # GOOGLE SHEETS (Cloud ADC)
 # =========================
+@lru_cache(maxsize=1)
 def sheets_service():
+    """Built once per process; warm Cloud Run instances reuse creds + client."""
     if not SHEET_ID:
         raise RuntimeError("Missing GOOGLE_SHEET_ID env var")
 
     creds, _ = google.auth.default(scopes=SCOPES)
-    return build("sheets", "v4", credentials=creds, cache_discovery=False)
+    if os.path.exists(SHEETS_DISCOVERY_PATH):
+        with open(SHEETS_DISCOVERY_PATH, "r", encoding="utf-8") as f:
+            return build_from_document(f.read(), credentials=creds)
+    # fall back to the discovery doc bundled with google-api-python-client (still offline)
+    return build("sheets", "v4", credentials=creds, static_discovery=True)
 
 
-def get_values(svc, tab: str, a1: str) -> List[List[Any]]:
+def get_values(
+    svc, tab: str, a1: str, value_render: str = VALUE_RENDER, date_render: str = DATE_RENDER
+) -> List[List[Any]]:
     resp = svc.spreadsheets().values().get(
         spreadsheetId=SHEET_ID,
         range=f"{tab}!{a1}",
+        valueRenderOption=value_render,
+        dateTimeRenderOption=date_render,
     ).execute()
     return resp.get("values", [])
 
 
+def batch_get_values(
+    svc, ranges: List[str], value_render: str = VALUE_RENDER, date_render: str = DATE_RENDER
+) -> List[List[List[Any]]]:
+    """ranges: ["Tab!A1", ...] -> values per range, same order, one round-trip"""
+    resp = svc.spreadsheets().values().batchGet(
+        spreadsheetId=SHEET_ID,
+        ranges=ranges,
+        valueRenderOption=value_render,
+        dateTimeRenderOption=date_render,
+    ).execute()
+    return [vr.get("values", []) for vr in resp.get("valueRanges", [])]
+
+
 def update_values(svc, tab: str, a1: str, values: List[List[Any]]) -> None:
     svc.spreadsheets().values().update(
         spreadsheetId=SHEET_ID,
@@ -222,20 +358,29 @@ def append_values(svc, tab: str, a1: str, values: List[List[Any]]) -> None:
     ).execute()
 
 
-def batch_update_cells(svc, updates: List[Tuple[str, List[List[Any]]]]) -> None:
-    """updates: [(A1range, [[val]]), ...]"""
+def batch_update_cells(svc, updates: List[Tuple[str, List[List[Any]]]], chunk_size: int = 200) -> None:
+    """updates: [(Tab!A1range, [[val]]), ...] -> one values.batchUpdate per chunk"""
     if not updates:
         return
-    data = [{"range": f"{SHEET_ID_RANGE}", "values": vals} for (SHEET_ID_RANGE, vals) in updates]
+    data = [{"range": rng, "values": vals} for (rng, vals) in updates]
+    for i in range(0, len(data), chunk_size):
+        svc.spreadsheets().values().batchUpdate(
+            spreadsheetId=SHEET_ID,
+            body={"valueInputOption": "USER_ENTERED", "data": data[i:i + chunk_size]},
+        ).execute()
 
 
-def ensure_headers(svc, tab: str, required: List[str]) -> Dict[str, int]:
+def ensure_headers(
+    svc, tab: str, required: List[str], header: Optional[List[List[Any]]] = None
+) -> Dict[str, int]:
     """
     Ensures required headers exist on row 1.
-    Missing headers are appended at the end.
+    Missing headers are appended at the end (the only write this does).
+    `header` is the pre-fetched 1:1 range; read from the sheet if omitted.
     Returns header->index map (0-based).
     """
-    header = get_values(svc, tab, "1:1")
+    if header is None:
+        header = get_values(svc, tab, "1:1")
     if not header or not header[0]:
         raise RuntimeError(f"{tab} missing header row")
 
@@ -259,16 +404,72 @@ def ensure_headers(svc, tab: str, required: List[str]) -> Dict[str, int]:
 # =========================
 # NBA FETCH (robust)
 # =========================
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/sec, up to `capacity` banked."""
+
+    def __init__(self, rate: float, capacity: int):
+        if rate <= 0 or capacity < 1:
+            raise ValueError(f"TokenBucket needs rate > 0 and capacity >= 1 (got {rate}, {capacity})")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.stamp = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        # reserve a token under the lock, sleep (if needed) outside it
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.rate)
+            self.stamp = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait + random.uniform(0, 0.2))
+
+
+NBA_BUCKET = TokenBucket(NBA_RATE, NBA_BURST)
+
+
+def new_session() -> requests.Session:
+    s = requests.Session()
+    s.headers.update(NBA_HEADERS)
+    s.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0))
+    return s
+
+
+# one keep-alive session shared by every NBA call (and every worker thread)
+SESSION = new_session()
+_SESSION_LOCK = threading.Lock()
+
+
+def clear_session(stale: requests.Session) -> None:
+    """Close + recreate SESSION (stats.nba.com can wedge a long-lived connection)."""
+    global SESSION
+    with _SESSION_LOCK:
+        if SESSION is not stale:
+            return  # another thread already replaced it
+        SESSION = new_session()
+    stale.close()
+
+
 def nba_fetch(url: str, params: Dict[str, str]) -> Dict[str, Any]:
     last_err = None
+    fails = 0
     for i in range(MAX_TRIES):
+        sess = SESSION
+        NBA_BUCKET.acquire()
         try:
-            r = requests.get(url, headers=NBA_HEADERS, params=params, timeout=REQ_TIMEOUT)
+            r = sess.get(url, params=params, timeout=REQ_TIMEOUT)
             if r.status_code == 200:
-                return r.json()
+                return orjson.loads(r.content)
             last_err = RuntimeError(f"NBA HTTP {r.status_code}: {r.text[:250]}")
         except Exception as e:
             last_err = e
+        fails += 1
+        if fails >= SESSION_RESET_AFTER:
+            clear_session(sess)
+            fails = 0
         jitter_sleep(i)
     raise RuntimeError(f"NBA fetch failed after {MAX_TRIES} tries: {last_err}")
 
@@ -299,29 +500,36 @@ def pick_home_away(rows: List[List[Any]], hidx: Dict[str, int]) -> Tuple[List[An
     if mi is None:
         return rows[0], rows[1] if len(rows) > 1 else rows[0]
 
+    # single pass; stop as soon as both sides are found
     home = None
     away = None
     for r in rows:
         m = str(r[mi] or "")
         if " vs " in m:
             home = r
-        if " @ " in m:
+        elif " @ " in m:
             away = r
+        else:
+            continue
+        if home is not None and away is not None:
+            return home, away
 
-    if home is None or away is None:
-        if len(rows) >= 2:
-            return rows[0], rows[1]
-        return rows[0], rows[0]
-    return home, away
+    if len(rows) >= 2:
+        return rows[0], rows[1]
+    return rows[0], rows[0]
 
 
 # =========================
 # COMPLETED GAMES
 # =========================
-def read_completed_index(svc) -> Dict[str, Any]:
-    col = ensure_headers(svc, TAB_COMPLETED, COMPLETED_EXPECTED)
-
-    data = get_values(svc, TAB_COMPLETED, "A2:ZZ")
+def read_completed_index(
+    svc, col: Optional[Dict[str, int]] = None, data: Optional[List[List[Any]]] = None
+) -> Dict[str, Any]:
+    if col is None:
+        col = ensure_headers(svc, TAB_COMPLETED, COMPLETED_EXPECTED)
+
+    if data is None:
+        data = get_values(svc, TAB_COMPLETED, data_range(col, COMPLETED_EXPECTED))
     cutoff = datetime.now() - timedelta(days=LOOKBACK_DAYS)
 
     espn_to_info: Dict[str, Dict[str, Any]] = {}
@@ -357,7 +565,12 @@ def read_completed_index(svc) -> Dict[str, Any]:
 # =========================
 # ESPN -> NBA mapping via ScoreboardV2
 # =========================
-def build_scoreboard_games_for_date(game_date: datetime) -> List[Dict[str, str]]:
+def matchup_key(home: Any, away: Any) -> str:
+    return f"{normalize_team_name(home)}|{normalize_team_name(away)}"
+
+
+def build_scoreboard_games_for_date(game_date: datetime) -> Dict[str, str]:
+    """{"normalized home|normalized away": NBA GAME_ID} for one scoreboard date"""
     params = {"GameDate": format_mdy(game_date), "LeagueID": "00", "DayOffset": "0"}
     j = nba_fetch(URL_SCOREBOARD, params)
 
@@ -367,59 +580,117 @@ def build_scoreboard_games_for_date(game_date: datetime) -> List[Dict[str, str]]
     gh = idx_map(gh_headers)
     ls = idx_map(ls_headers)
 
+    ti = ls.get("TEAM_ID")
+    ci = ls.get("TEAM_CITY_NAME")
+    ni = ls.get("TEAM_NICKNAME")
+    if ti is None:
+        return {}
+
     # TEAM_ID -> "City Nickname"
     team_id_to_name: Dict[str, str] = {}
     for r in ls_rows:
-        tid = str(r[ls["TEAM_ID"]]) if "TEAM_ID" in ls else ""
-        city = str(r[ls.get("TEAM_CITY_NAME", -1)]) if ls.get("TEAM_CITY_NAME") is not None else ""
-        nick = str(r[ls.get("TEAM_NICKNAME", -1)]) if ls.get("TEAM_NICKNAME") is not None else ""
+        tid = str(r[ti])
+        city = str(r[ci]) if ci is not None else ""
+        nick = str(r[ni]) if ni is not None else ""
         full = f"{city} {nick}".strip()
         if tid and full:
             team_id_to_name[tid] = full
 
-    games: List[Dict[str, str]] = []
-    for r in gh_rows:
-        game_id = str(r[gh["GAME_ID"]]).strip()
-        home_tid = str(r[gh["HOME_TEAM_ID"]]).strip()
-        away_tid = str(r[gh["VISITOR_TEAM_ID"]]).strip()
+    gi, hi, vi = gh["GAME_ID"], gh["HOME_TEAM_ID"], gh["VISITOR_TEAM_ID"]
 
-        home_name = team_id_to_name.get(home_tid, "")
-        away_name = team_id_to_name.get(away_tid, "")
+    games: Dict[str, str] = {}
+    for r in gh_rows:
+        game_id = str(r[gi]).strip()
+        home_name = team_id_to_name.get(str(r[hi]).strip(), "")
+        away_name = team_id_to_name.get(str(r[vi]).strip(), "")
 
         if game_id and home_name and away_name:
-            games.append({"nba_game_id": game_id, "home": home_name, "away": away_name})
+            games[matchup_key(home_name, away_name)] = game_id
 
     return games
 
 
+def load_scoreboard_cache() -> Dict[str, Dict[str, str]]:
+    """{"YYYY-MM-DD": {"home|away": nba_game_id}} (best effort, {} on any failure)"""
+    try:
+        if SCOREBOARD_CACHE_BUCKET:
+            from google.cloud import storage
+
+            blob = storage.Client().bucket(SCOREBOARD_CACHE_BUCKET).blob(SCOREBOARD_CACHE_BLOB)
+            if not blob.exists():
+                return {}
+            raw = blob.download_as_text()
+        else:
+            if not os.path.exists(SCOREBOARD_CACHE_PATH):
+                return {}
+            with open(SCOREBOARD_CACHE_PATH, "r", encoding="utf-8") as f:
+                raw = f.read()
+        cache = json.loads(raw)
+        return cache if isinstance(cache, dict) else {}
+    except Exception as e:
+        print(f"Scoreboard cache not loaded: {e}")
+        return {}
+
+
+def save_scoreboard_cache(cache: Dict[str, Dict[str, str]]) -> None:
+    raw = json.dumps(cache, separators=(",", ":"), sort_keys=True)
+    try:
+        if SCOREBOARD_CACHE_BUCKET:
+            from google.cloud import storage
+
+            blob = storage.Client().bucket(SCOREBOARD_CACHE_BUCKET).blob(SCOREBOARD_CACHE_BLOB)
+            blob.upload_from_string(raw, content_type="application/json")
+        else:
+            tmp = SCOREBOARD_CACHE_PATH + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(raw)
+            os.replace(tmp, SCOREBOARD_CACHE_PATH)
+    except Exception as e:
+        print(f"Scoreboard cache not saved: {e}")
+
+
 def map_espn_to_nba(espn_to_info: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
-    date_to_list: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+    date_to_list: Dict[date, List[Tuple[str, Dict[str, Any]]]] = defaultdict(list)
     for espn_id, info in espn_to_info.items():
-        dkey = info["date"].strftime("%Y-%m-%d")
-        date_to_list.setdefault(dkey, []).append((espn_id, info))
+        date_to_list[info["date"].date()].append((espn_id, info))
 
     out: Dict[str, str] = {}
 
-    for dkey, games in date_to_list.items():
-        dt = games[0][1]["date"]
-        dt_day = datetime(dt.year, dt.month, dt.day)
-
-        nba_games = build_scoreboard_games_for_date(dt_day)
-
-        lookup: Dict[str, str] = {}
-        for g in nba_games:
-            h = normalize_team_name(g["home"])
-            a = normalize_team_name(g["away"])
-            lookup[f"{h}|{a}"] = g["nba_game_id"]
+    cache = load_scoreboard_cache()
+    cache_dirty = False
+    # today/yesterday can still shift (postponements, late finals) -> always refetch
+    fresh_from = (datetime.now() - timedelta(days=1)).date()
+    fetched = 0
 
+    def resolve(lookup: Dict[str, str], games) -> Dict[str, str]:
+        found: Dict[str, str] = {}
         for espn_id, info in games:
-            h = normalize_team_name(info["home"])
-            a = normalize_team_name(info["away"])
-            nba_id = lookup.get(f"{h}|{a}", "")
+            nba_id = lookup.get(matchup_key(info["home"], info["away"]), "")
             if nba_id:
-                out[espn_id] = nba_id
+                found[espn_id] = nba_id
+        return found
+
+    for d, games in date_to_list.items():
+        dkey = d.isoformat()  # cache key: YYYY-MM-DD
+        cached = cache.get(dkey)
+        if isinstance(cached, dict) and d < fresh_from:
+            found = resolve(cached, games)
+            if len(found) == len(games):
+                out.update(found)
+                continue
+
+        dt_day = datetime(d.year, d.month, d.day)
+
+        nba_games = build_scoreboard_games_for_date(dt_day)
+        cache[dkey] = nba_games
+        cache_dirty = True
+        fetched += 1
+
+        out.update(resolve(nba_games, games))
 
-        time.sleep(0.7 + random.uniform(0, 0.4))
+    if cache_dirty:
+        save_scoreboard_cache(cache)
+    print(f"Scoreboard dates: {len(date_to_list)} (fetched {fetched}, cached {len(date_to_list) - fetched})")
 
     return out
 
@@ -427,27 +698,46 @@ def map_espn_to_nba(espn_to_info: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
 # =========================
 # ADV sheet index
 # =========================
-def read_adv_index(svc) -> Dict[str, Any]:
-    col = ensure_headers(svc, TAB_ADV, ADV_COLUMNS)
-    data = get_values(svc, TAB_ADV, "A2:ZZ")
+def read_adv_index(
+    svc, col: Optional[Dict[str, int]] = None, columns: Optional[List[List[List[Any]]]] = None
+) -> Dict[str, Any]:
+    """
+    Game ID index over the ADV tab.
+    `columns` is the batchGet result for column_ranges(col, ADV_INDEX_COLUMNS);
+    read from the sheet if omitted.
+    """
+    if col is None:
+        col = ensure_headers(svc, TAB_ADV, ADV_COLUMNS)
+    if columns is None:
+        columns = batch_get_values(svc, [f"{TAB_ADV}!{rng}" for rng in column_ranges(col, ADV_INDEX_COLUMNS)])
 
-    gid_idx = col["Game ID"]
-    status_idx = col["Status"]
-    key_idx = col["Key"]
+    keys, gids, statuses, attempts = (flatten_column(c) for c in columns)
 
     gid_to_row: Dict[str, int] = {}
     gid_to_status: Dict[str, str] = {}
     gid_to_key: Dict[str, str] = {}
+    gid_to_last_attempt: Dict[str, datetime] = {}
 
-    for i, r in enumerate(data, start=2):
-        gid = str(r[gid_idx]).strip() if gid_idx < len(r) else ""
+    for j, raw_gid in enumerate(gids):
+        gid = str(raw_gid).strip()
         if not gid:
             continue
-        gid_to_row[gid] = i
-        gid_to_status[gid] = str(r[status_idx]).strip().upper() if status_idx < len(r) else ""
-        gid_to_key[gid] = str(r[key_idx]).strip() if key_idx < len(r) else ""
-
-    return {"col": col, "gid_to_row": gid_to_row, "gid_to_status": gid_to_status, "gid_to_key": gid_to_key}
+        status = str(statuses[j]).strip().upper() if j < len(statuses) else ""
+        gid_to_row[gid] = j + 2  # actual sheet row number
+        gid_to_status[gid] = status
+        gid_to_key[gid] = str(keys[j]).strip() if j < len(keys) else ""
+
+        last_attempt = parse_sheet_date(attempts[j]) if j < len(attempts) else None
+        if last_attempt:
+            gid_to_last_attempt[gid] = last_attempt
+
+    return {
+        "col": col,
+        "gid_to_row": gid_to_row,
+        "gid_to_status": gid_to_status,
+        "gid_to_key": gid_to_key,
+        "gid_to_last_attempt": gid_to_last_attempt,
+    }
 
 
 # =========================
@@ -463,8 +753,12 @@ def fetch_adv_row(nba_game_id: str, game_dt_hint: Optional[datetime], existing_k
         "RangeType": "0",
     }
 
-    trad = nba_fetch(URL_TRAD, params)
-    adv = nba_fetch(URL_ADV, params)
+    # trad + adv are independent -> fetch both at once
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        trad_f = pool.submit(nba_fetch, URL_TRAD, params)
+        adv_f = pool.submit(nba_fetch, URL_ADV, params)
+        trad = trad_f.result()
+        adv = adv_f.result()
 
     trad_headers, trad_rows = parse_resultset(trad, "TeamStats")
     adv_headers, adv_rows = parse_resultset(adv, "TeamStats")
@@ -492,35 +786,18 @@ def fetch_adv_row(nba_game_id: str, game_dt_hint: Optional[datetime], existing_k
 
     home_pts = home_trad[tix.get("PTS")]
     away_pts = away_trad[tix.get("PTS")]
-    total_pts = (float(home_pts) + float(away_pts)) if is_num(home_pts) and is_num(away_pts) else ""
-
-    def h(field: str):
-        i = aix.get(field)
-        return home_adv[i] if i is not None else ""
-
-    def a(field: str):
-        i = aix.get(field)
-        return away_adv[i] if i is not None else ""
-
-    home_poss = h("POSS")
-    away_poss = a("POSS")
-    poss_avg = ((float(home_poss) + float(away_poss)) / 2) if is_num(home_poss) and is_num(away_poss) else ""
-
-    home_off = h("OFF_RATING")
-    away_off = a("OFF_RATING")
-
-    home_efg = h("EFG_PCT")
-    away_efg = a("EFG_PCT")
-    home_ts = h("TS_PCT")
-    away_ts = a("TS_PCT")
-    home_ftr = h("FTA_RATE")
-    away_ftr = a("FTA_RATE")
-    home_tov = h("TM_TOV_PCT")
-    away_tov = a("TM_TOV_PCT")
-    home_3par = h("FG3A_RATE")
-    away_3par = a("FG3A_RATE")
-    home_orb = h("OREB_PCT")
-    away_orb = a("OREB_PCT")
+    pts = _safe_floats(home_pts, away_pts)
+    total_pts = sum(pts) if pts else ""
+
+    # resolve field positions once, then read both rows positionally
+    idxs = tuple(aix.get(f) for f in ADV_STAT_FIELDS)
+    home_vals = [home_adv[i] if i is not None else "" for i in idxs]
+    away_vals = [away_adv[i] if i is not None else "" for i in idxs]
+
+    home_poss = home_vals[0]
+    away_poss = away_vals[0]
+    poss = _safe_floats(home_poss, away_poss)
+    poss_avg = (sum(poss) / 2) if poss else ""
 
     game_date_value = ""
     if game_dt_hint:
@@ -540,38 +817,61 @@ def fetch_adv_row(nba_game_id: str, game_dt_hint: Optional[datetime], existing_k
         home_poss,           # Home Poss
         away_poss,           # Away Poss
         poss_avg,            # Poss Avg
-        home_off,            # Home OffRtg
-        away_off,            # Away OffRtg
-        home_efg,            # Home eFG%
-        away_efg,            # Away eFG%
-        home_ts,             # Home TS%
-        away_ts,             # Away TS%
-        home_ftr,            # Home FTr
-        away_ftr,            # Away FTr
-        home_tov,            # Home TOV%
-        away_tov,            # Away TOV%
-        home_3par,           # Home 3PAr
-        away_3par,           # Away 3PAr
-        home_orb,            # Home ORB%
-        away_orb,            # Away ORB%
-        "OK",                # Status
-        now_iso(),           # Last Attempt
     ]
-
-    if not is_num(home_pts) or not is_num(away_pts):
+    # Home/Away OffRtg, eFG%, TS%, FTr, TOV%, 3PAr, ORB%
+    for hv, av in zip(home_vals[1:], away_vals[1:]):
+        row.append(hv)
+        row.append(av)
+    row.append("OK")         # Status
+    row.append(now_iso())    # Last Attempt
+
+    if not pts:
         row[ADV_COLUMNS.index("Status")] = "ERR: missing points"
 
     return row
 
 
+def fetch_adv_row_safe(nba_id: str, dt_hint: Optional[datetime], existing_key: str) -> List[Any]:
+    """fetch_adv_row, but failures become an ERR row instead of raising"""
+    try:
+        rowvals = fetch_adv_row(nba_id, dt_hint, existing_key)
+    except Exception as e:
+        rowvals = [""] * len(ADV_COLUMNS)
+        # keep date + key so the ERR row still identifies its game
+        if dt_hint:
+            rowvals[ADV_COLUMNS.index("Game Date")] = dt_hint.strftime("%m/%d/%Y %H:%M")
+        rowvals[ADV_COLUMNS.index("Key")] = existing_key.strip() if existing_key else ""
+        rowvals[ADV_COLUMNS.index("Game ID")] = str(nba_id)
+        rowvals[ADV_COLUMNS.index("Status")] = f"ERR: {str(e)[:160]}"
+        rowvals[ADV_COLUMNS.index("Last Attempt")] = now_iso()
+    return rowvals
+
+
 # =========================
 # MAIN
 # =========================
 def main():
     svc = sheets_service()
 
-    # 1) Read completed games (home rows define matchup identity)
-    completed = read_completed_index(svc)
+    # 0) Headers for both tabs, then only the columns we actually use
+    comp_header, adv_header = batch_get_values(svc, [f"{TAB_COMPLETED}!1:1", f"{TAB_ADV}!1:1"])
+    col_comp = ensure_headers(svc, TAB_COMPLETED, COMPLETED_EXPECTED, comp_header)
+    col_adv = ensure_headers(svc, TAB_ADV, ADV_COLUMNS, adv_header)
+
+    comp_data, *adv_columns = batch_get_values(svc, [
+        f"{TAB_COMPLETED}!{data_range(col_comp, COMPLETED_EXPECTED)}",
+        *(f"{TAB_ADV}!{rng}" for rng in column_ranges(col_adv, ADV_INDEX_COLUMNS)),
+    ])
+
+    # 1) Read ADV index so we can upsert by Game ID
+    adv = read_adv_index(svc, col_adv, adv_columns)
+    gid_to_row = adv["gid_to_row"]
+    gid_to_status = adv["gid_to_status"]
+    gid_to_key = adv["gid_to_key"]
+    gid_to_last_attempt = adv["gid_to_last_attempt"]
+
+    # 1b) Read completed games (home rows define matchup identity)
+    completed = read_completed_index(svc, col_comp, comp_data)
     espn_to_info = completed["espn_to_info"]
     row_refs = completed["row_refs"]
     col_completed = completed["col"]
@@ -580,17 +880,41 @@ def main():
         print("No recent completed games found in lookback window.")
         return
 
+    # Drop games where every Completed row (home + away) already holds an NBA ID whose
+    # ADV row is OK: nothing left to do for them, so don't spend scoreboard calls on them.
+    known_nba: Dict[str, str] = {}
+    espn_done: Dict[str, bool] = {}
+    for ref in row_refs:
+        espn_id = ref["espn_id"]
+        nba_id = ref["nba_id_existing"]
+        if nba_id:
+            known_nba.setdefault(espn_id, nba_id)
+        ref_done = bool(nba_id) and gid_to_status.get(nba_id, "") == "OK"
+        espn_done[espn_id] = espn_done.get(espn_id, True) and ref_done
+
+    espn_to_info = {
+        espn_id: info
+        for espn_id, info in espn_to_info.items()
+        if not espn_done.get(espn_id, False)
+    }
+    if not espn_to_info:
+        print("All recent games already have OK ADV rows.")
+        return
+
     # 2) Map ESPN -> NBA Game ID using scoreboard per date
-    espn_to_nba = map_espn_to_nba(espn_to_info)
+    # (IDs already on the Completed tab seed the map, so a row missing its ID still
+    # gets written back even if the scoreboard lookup comes up empty)
+    espn_to_nba = {espn_id: known_nba[espn_id] for espn_id in espn_to_info if espn_id in known_nba}
+    espn_to_nba.update(map_espn_to_nba(espn_to_info))
     if not espn_to_nba:
         print("No ESPN->NBA mappings found (lookback window).")
         return
 
-    # 3) Write NBA Game ID back into Completed Games tab (best effort)
+    # 3) NBA Game ID writeback for Completed Games tab (sent with the ADV rows in step 5)
     nba_id_col_idx = col_completed["NBA Game ID"]  # 0-based
     nba_id_col_letter = col_to_a1(nba_id_col_idx)
 
-    batch_data = []
+    batch_data: List[Tuple[str, List[List[Any]]]] = []
     for ref in row_refs:
         espn_id = ref["espn_id"]
         existing = str(ref["nba_id_existing"] or "").strip()
@@ -598,27 +922,9 @@ def main():
         if nba_id and nba_id != existing:
             rownum = ref["rownum"]
             rng = f"{TAB_COMPLETED}!{nba_id_col_letter}{rownum}"
-            batch_data.append({"range": rng, "values": [[nba_id]]})
-
-    if batch_data:
-        # send in chunks
-        for i in range(0, len(batch_data), 200):
-            chunk = batch_data[i:i + 200]
-            svc.spreadsheets().values().batchUpdate(
-                spreadsheetId=SHEET_ID,
-                body={"valueInputOption": "USER_ENTERED", "data": chunk},
-            ).execute()
-        print(f"✅ Updated NBA Game ID in {TAB_COMPLETED}: {len(batch_data)} cells")
-    else:
-        print("Completed Games NBA IDs already up to date (or nothing to write).")
+            batch_data.append((rng, [[nba_id]]))
 
-    # 4) Read ADV index so we can upsert by Game ID
-    adv = read_adv_index(svc)
-    gid_to_row = adv["gid_to_row"]
-    gid_to_status = adv["gid_to_status"]
-    gid_to_key = adv["gid_to_key"]
-
-    # 5) Build list of NBA games to process (newest first)
+    # 4) Build list of NBA games to process (newest first)
     nba_games: List[Tuple[str, datetime]] = []
     for espn_id, info in espn_to_info.items():
         nba_id = espn_to_nba.get(espn_id, "")
@@ -627,53 +933,77 @@ def main():
 
     nba_games.sort(key=lambda x: x[1], reverse=True)
 
-    processed = 0
-    updates: List[Tuple[int, List[Any]]] = []
-    appends: List[List[Any]] = []
-
+    now = datetime.now()
+    backed_off = 0
+    next_retry: Optional[datetime] = None
+    todo: List[Tuple[str, datetime]] = []
     for nba_id, dt_hint in nba_games:
-        if processed >= MAX_GAMES_PER_RUN:
+        if len(todo) >= MAX_GAMES_PER_RUN:
             break
 
         existing_row = gid_to_row.get(nba_id)
         existing_status = gid_to_status.get(nba_id, "")
-        existing_key = gid_to_key.get(nba_id, "")
 
         # Skip rows already OK
         if existing_row and existing_status == "OK":
             continue
 
-        processed += 1
-
-        try:
-            rowvals = fetch_adv_row(nba_id, dt_hint, existing_key)
-        except Exception as e:
-            rowvals = [""] * len(ADV_COLUMNS)
-            rowvals[ADV_COLUMNS.index("Game ID")] = str(nba_id)
-            rowvals[ADV_COLUMNS.index("Status")] = f"ERR: {str(e)[:160]}"
-            rowvals[ADV_COLUMNS.index("Last Attempt")] = now_iso()
+        # Skip ERR rows still inside their backoff window. This is the only thing that
+        # throttles ERR rows: the done filter above always keeps them.
+        attempts = err_attempts(existing_status) if existing_row else 0
+        last_attempt = gid_to_last_attempt.get(nba_id)
+        if attempts and last_attempt and now - last_attempt < backoff_for(attempts):
+            backed_off += 1
+            retry_at = last_attempt + backoff_for(attempts)
+            if next_retry is None or retry_at < next_retry:
+                next_retry = retry_at
+            continue
 
-        if existing_row:
-            updates.append((existing_row, rowvals))
-        else:
-            appends.append(rowvals)
+        todo.append((nba_id, dt_hint))
 
-        time.sleep(0.9 + random.uniform(0, 0.6))  # be polite
+    processed = len(todo)
+    if backed_off:
+        print(f"ERR rows backing off: {backed_off} (next retry after {next_retry:%Y-%m-%d %H:%M})")
+    updates: List[Tuple[int, List[Any]]] = []
+    appends: List[List[Any]] = []
 
-    # 6) Apply updates/appends
+    with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as pool:
+        results = pool.map(
+            lambda g: fetch_adv_row_safe(g[0], g[1], gid_to_key.get(g[0], "")),
+            todo,
+        )
+        # map() yields in submission order, so results are collected on this thread
+        for (nba_id, _), rowvals in zip(todo, results):
+            existing_row = gid_to_row.get(nba_id)
+            si = ADV_COLUMNS.index("Status")
+            prev = err_attempts(gid_to_status.get(nba_id, "")) if existing_row else 0
+            rowvals[si] = with_err_attempts(rowvals[si], prev + 1)
+            if existing_row:
+                updates.append((existing_row, rowvals))
+            else:
+                appends.append(rowvals)
+
+    # 5) Apply NBA ID writeback + ADV updates in one batchUpdate (both tabs)
     # Determine A1 width from ADV_COLUMNS count
     last_col_letter = col_to_a1(len(ADV_COLUMNS) - 1)
 
-    if updates:
-        updates.sort(key=lambda x: x[0])
-        for rownum, vals in updates:
-            a1 = f"A{rownum}:{last_col_letter}{rownum}"
-            update_values(svc, TAB_ADV, a1, [vals])
+    updates.sort(key=lambda x: x[0])
+    batch_update_cells(svc, batch_data + [
+        (f"{TAB_ADV}!A{rownum}:{last_col_letter}{rownum}", [vals])
+        for rownum, vals in updates
+    ])
 
+    # New rows go through values.append: the server picks the rows atomically, so an
+    # overlapping run (another instance, a scheduler retry) can't overwrite them.
     if appends:
         append_values(svc, TAB_ADV, f"A:{last_col_letter}", appends)
 
-    print(f"Done. processed={processed} updates={len(updates)} appends={len(appends)}")
+    if batch_data:
+        print(f"✅ Updated NBA Game ID in {TAB_COMPLETED}: {len(batch_data)} cells")
+    else:
+        print("Completed Games NBA IDs already up to date (or nothing to write).")
+
+    print(f"Done. processed={processed} backed_off={backed_off} updates={len(updates)} appends={len(appends)}")
 
 
 if __name__ == "__main__":
@@ -1,29 +1,34 @@
-import os
-import subprocess
+import io
+import threading
+import traceback
+from contextlib import redirect_stdout
 from flask import Flask, jsonify
 
+from adv_update import main as run_main
+
 app = Flask(__name__)
 
+# one update at a time: runs share the Sheets client and stdout capture
+_RUN_LOCK = threading.Lock()
+
 @app.get("/")
 def health():
     return jsonify({"ok": True, "service": "nba-predictive-model"}), 200
 
 @app.post("/run")
 def run_job():
-    try:
-        result = subprocess.run(
-            ["python", "adv_update.py"],
-            capture_output=True,
-            text=True,
-            check=False,
-            env=os.environ.copy(),
-        )
-        return jsonify({
-            "ok": result.returncode == 0,
-            "returncode": result.returncode,
-            "stdout": result.stdout[-4000:],
-            "stderr": result.stderr[-4000:],
-        }), (200 if result.returncode == 0 else 500)
-    except Exception as e:
-        return jsonify({"ok": False, "error": str(e)}), 500
+    with _RUN_LOCK:
+        out = io.StringIO()
+        try:
+            with redirect_stdout(out):
+                run_main()
+            returncode, stderr = 0, ""
+        except Exception:
+            returncode, stderr = 1, traceback.format_exc()
 
+    return jsonify({
+        "ok": returncode == 0,
+        "returncode": returncode,
+        "stdout": out.getvalue()[-4000:],
+        "stderr": stderr[-4000:],
+    }), (200 if returncode == 0 else 500)